@@ -1 +1 @@
-from .ensure_json import ensure_json, ensure_json_async, JsonFixError
+from .ensure_json import ensure_json, ensure_json_async, ensure_json_many, JsonFixError
@@ -0,0 +1,208 @@
+/*
+ * Optional C build of ensure_json's _normalize pass.
+ *
+ * normalize(text) quotes bare keys, rewrites single-quoted strings as
+ * double-quoted ones, drops trailing commas and collects the closing
+ * brackets still needed, exactly like the pure-Python _normalize_py. It
+ * reads the str's native UCS1/UCS2/UCS4 buffer directly, writes into one
+ * output buffer of the same kind, and releases the GIL while scanning.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+static int
+is_word(Py_UCS4 ch)
+{
+    return ch == '_' || Py_UNICODE_ISALNUM(ch);
+}
+
+static int
+is_space(Py_UCS4 ch)
+{
+    return ch == ' ' || ch == '\t' || ch == '\r' || ch == '\n';
+}
+
+/* Writes the normalized text into `out` and returns its length.
+ * `out` must hold 2 * n characters: a bare key "a:" grows by two per two
+ * input characters, and '"' inside a single-quoted string becomes '\"'.
+ * The closers for brackets left open outside strings go to `stack`, which
+ * must hold n characters, outermost first; their count goes to `depth`. */
+static Py_ssize_t
+scan(int kind, const void *src, Py_ssize_t n, void *out,
+     Py_UCS1 *stack, Py_ssize_t *depth)
+{
+    Py_ssize_t i = 0;
+    Py_ssize_t j = 0;
+    Py_ssize_t d = 0;
+    Py_UCS4 in_string = 0; /* 0, '\'' or '"' */
+    int escaped = 0;
+
+#define READ(idx) PyUnicode_READ(kind, src, (idx))
+#define EMIT(c) PyUnicode_WRITE(kind, out, j++, (c))
+
+    while (i < n) {
+        Py_UCS4 ch = READ(i);
+        if (in_string == '"') {
+            EMIT(ch);
+            if (escaped)
+                escaped = 0;
+            else if (ch == '\\')
+                escaped = 1;
+            else if (ch == '"')
+                in_string = 0;
+        }
+        else if (in_string == '\'') {
+            if (escaped) {
+                /* \' needs no escape once the string is double-quoted */
+                if (ch != '\'')
+                    EMIT('\\');
+                EMIT(ch);
+                escaped = 0;
+            }
+            else if (ch == '\\') {
+                escaped = 1;
+            }
+            else if (ch == '\'') {
+                EMIT('"');
+                in_string = 0;
+            }
+            else if (ch == '"') {
+                EMIT('\\');
+                EMIT('"');
+            }
+            else {
+                EMIT(ch);
+            }
+        }
+        else if (ch == '"' || ch == '\'') {
+            EMIT('"');
+            in_string = ch;
+        }
+        else if (is_word(ch)) {
+            /* A bare word is a key when the next non-space character is ':' */
+            Py_ssize_t end = i + 1;
+            Py_ssize_t k;
+            int is_key;
+            while (end < n && is_word(READ(end)))
+                end++;
+            k = end;
+            while (k < n && is_space(READ(k)))
+                k++;
+            is_key = k < n && READ(k) == ':';
+            if (is_key)
+                EMIT('"');
+            for (; i < end; i++)
+                EMIT(READ(i));
+            if (is_key)
+                EMIT('"');
+            continue;
+        }
+        else if (ch == '{' || ch == '[') {
+            stack[d++] = ch == '{' ? '}' : ']';
+            EMIT(ch);
+        }
+        else if (ch == '}' || ch == ']') {
+            if (d > 0)
+                d--;
+            EMIT(ch);
+        }
+        else if (ch == ',') {
+            /* Trailing comma: only whitespace before a closer or the end */
+            Py_ssize_t k = i + 1;
+            while (k < n && is_space(READ(k)))
+                k++;
+            if (k < n && READ(k) != '}' && READ(k) != ']')
+                EMIT(',');
+        }
+        else {
+            EMIT(ch);
+        }
+        i++;
+    }
+
+#undef READ
+#undef EMIT
+    *depth = d;
+    return j;
+}
+
+static PyObject *
+normalize(PyObject *self, PyObject *arg)
+{
+    int kind;
+    const void *data;
+    Py_ssize_t n;
+    Py_ssize_t length;
+    Py_ssize_t depth;
+    Py_ssize_t k;
+    void *out;
+    Py_UCS1 *stack;
+    Py_UCS1 *closers_data;
+    PyObject *result;
+    PyObject *closers;
+
+    if (!PyUnicode_Check(arg)) {
+        PyErr_Format(PyExc_TypeError,
+                     "normalize() argument must be str, not %.200s",
+                     Py_TYPE(arg)->tp_name);
+        return NULL;
+    }
+#if PY_VERSION_HEX < 0x030C0000
+    if (PyUnicode_READY(arg) < 0)
+        return NULL;
+#endif
+
+    kind = PyUnicode_KIND(arg);
+    data = PyUnicode_DATA(arg);
+    n = PyUnicode_GET_LENGTH(arg);
+
+    out = PyMem_RawMalloc((size_t)(2 * n + 1) * (size_t)kind);
+    stack = PyMem_RawMalloc((size_t)n + 1);
+    if (out == NULL || stack == NULL) {
+        PyMem_RawFree(out);
+        PyMem_RawFree(stack);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    length = scan(kind, data, n, out, stack, &depth);
+    Py_END_ALLOW_THREADS
+
+    result = PyUnicode_FromKindAndData(kind, out, length);
+    PyMem_RawFree(out);
+    closers = result == NULL ? NULL : PyUnicode_New(depth, 127);
+    if (closers == NULL) {
+        PyMem_RawFree(stack);
+        Py_XDECREF(result);
+        return NULL;
+    }
+    /* Innermost first, like "".join(reversed(stack)) in _normalize_py */
+    closers_data = PyUnicode_1BYTE_DATA(closers);
+    for (k = 0; k < depth; k++)
+        closers_data[k] = stack[depth - 1 - k];
+    PyMem_RawFree(stack);
+    return Py_BuildValue("(NN)", result, closers);
+}
+
+static PyMethodDef core_methods[] = {
+    {"normalize", normalize, METH_O,
+     "normalize(text)\n--\n\n"
+     "Quote bare keys, turn single-quoted strings into double-quoted ones\n"
+     "and drop trailing commas. Returns (text, closers), where closers\n"
+     "finishes the brackets left open outside strings, innermost first."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef core_module = {
+    PyModuleDef_HEAD_INIT,
+    "_ensure_json_core",
+    "C implementation of ensure_json's repair hot path.",
+    -1,
+    core_methods
+};
+
+PyMODINIT_FUNC
+PyInit__ensure_json_core(void)
+{
+    return PyModule_Create(&core_module);
+}
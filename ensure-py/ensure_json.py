@@ -1,5 +1,53 @@
+import functools
 import json
-import re
+import sys
+from typing import List, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    _loads = _probe_loads = json.loads
+else:
+    def _probe_loads(text):
+        # The upfront probe is a single parse attempt, so a malformed input
+        # costs one failed parse; the rare NaN input still parses after repair
+        obj = orjson.loads(text)
+        if _may_round(text) and _rounded(obj):
+            # orjson silently turned an integer beyond 64 bits into a float
+            return json.loads(text)
+        return obj
+
+    def _loads(text):
+        try:
+            return _probe_loads(text)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity, which the stdlib parser accepts
+            return json.loads(text)
+
+# Maps every digit to "0", so a run of 19+ digits (the shortest integer that
+# can fall outside 64 bits, e.g. -9223372036854775809) becomes one substring
+# search. bytes.translate and `in` scan at C speed, unlike a regex.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGIT_RUN = b"0" * 19
+_INT64_BOUND = 2.0 ** 63
+
+def _may_round(text) -> bool:
+    data = text.encode() if isinstance(text, str) else bytes(text)
+    return _LONG_DIGIT_RUN in data.translate(_DIGITS_TO_ZERO)
+
+def _rounded(obj) -> bool:
+    """True if `obj` holds a float as large as a rounded 64-bit overflow."""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        elif kind is float and not -_INT64_BOUND < value < _INT64_BOUND:
+            return True
+    return False
 
 class JsonFixError(Exception):
     """Raised when JSON repair fails."""
@@ -7,52 +55,376 @@ class JsonFixError(Exception):
         super().__init__(message)
         self.raw = raw
 
-def ensure_json(raw: str, schema=None):
+def ensure_json(raw: str, schema=None, *, validate: str = "full"):
     """
     Repairs and parses 'almost-JSON' text from LLMs.
     Optionally validates with a schema (e.g., pydantic model).
+
+    `validate` controls how a schema is applied:
+      - "full": run the schema's validator (default).
+      - "construct": build the model, and any nested models, with
+        model_construct and skip validation. Only for trusted shapes;
+        anything relying on coercion (age "25" -> 25) or constraints
+        (age >= 0) must stay on "full".
+      - "none": ignore the schema and return the parsed object.
+
+    `schema` may also be a msgspec.Struct subclass, in which case the text
+    is decoded and validated in one msgspec pass ("full" and "construct"
+    behave the same).
     """
-    try:
-        parsed = json.loads(raw)
-    except Exception:
-        parsed = _try_repair(raw)
-    if schema:
+    if validate not in _VALIDATE_MODES:
+        raise ValueError(f"validate must be one of {_VALIDATE_MODES}, got {validate!r}")
+    if validate != "none" and _is_struct(schema):
+        return _decode_struct(raw, schema)
+    return _validate(_parse(raw), raw, schema, validate)
+
+async def ensure_json_async(raw: str, schema=None, *, validate: str = "full"):
+    return ensure_json(raw, schema, validate=validate)
+
+def ensure_json_many(texts, schema=None, *, validate: str = "full", max_workers=None):
+    """
+    Batch version of ensure_json: returns one result per input, in order,
+    and raises JsonFixError for the first input that fails.
+
+    Pydantic v2 schemas are validated in a single call over the whole list,
+    unless the class has its own prebuilt `_adapter`, which then validates
+    each item just as in ensure_json. With `max_workers`, inputs are parsed
+    and repaired in a thread pool of that size. Only the C extension's scan
+    releases the GIL, so the pool is usually slower than a plain loop.
+    """
+    if validate not in _VALIDATE_MODES:
+        raise ValueError(f"validate must be one of {_VALIDATE_MODES}, got {validate!r}")
+    texts = list(texts)
+    if validate != "none" and _is_struct(schema):
+        return _map(lambda raw: _decode_struct(raw, schema), texts, max_workers)
+    parsed = _map(_parse, texts, max_workers)
+    if (
+        schema
+        and validate == "full"
+        and hasattr(schema, "model_validate")
+        and _prebuilt_adapter(schema) is None
+    ):
         try:
-            return schema.parse_obj(parsed)
+            return _list_adapter_for(schema).validate_python(parsed)
         except Exception:
-            raise JsonFixError("Schema validation failed", raw)
-    return parsed
+            pass  # validate one by one below to report the failing input
+    return [_validate(obj, raw, schema, validate) for obj, raw in zip(parsed, texts)]
 
-async def ensure_json_async(raw: str, schema=None):
-    return ensure_json(raw, schema)
+def _map(func, items: list, max_workers) -> list:
+    if not max_workers or max_workers == 1:
+        return [func(item) for item in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(func, items))
 
-def _try_repair(raw: str):
-    text = raw
+def _parse(raw: str):
+    # Fast path: JSON-mode and well-behaved outputs are valid as-is, so try
+    # a plain parse before any repair work
+    try:
+        return _probe_loads(raw)
+    except (ValueError, RecursionError):
+        # Deeply nested input exhausts the stdlib parser's recursion limit;
+        # _try_repair then reports it as a JsonFixError like any other
+        return _try_repair(raw)
 
-    # 1. Remove markdown fences
-    text = re.sub(r"^\s*```(?:json)?|```\s*$", "", text, flags=re.MULTILINE)
+_VALIDATE_MODES = ("full", "construct", "none")
 
-    # 2. Slice from first { or [
-    brace_pos = min([i for i in [text.find("{"), text.find("[")] if i != -1] or [0])
-    text = text[brace_pos:]
+def _validate(parsed, raw: str, schema, validate: str):
+    """Applies `schema` to an already parsed object according to `validate`."""
+    if not schema or validate == "none":
+        return parsed
+    try:
+        if validate == "construct":
+            if not isinstance(parsed, dict):
+                raise TypeError("construct needs a JSON object")
+            return _construct_recursive(schema, parsed)
+        return _validator_for(schema)(parsed)
+    except Exception:
+        raise JsonFixError("Schema validation failed", raw)
 
-    # 3. Remove trailing commas
-    text = re.sub(r",\s*([}\]])", r"\1", text)
+@functools.lru_cache(maxsize=128)
+def _validator_for(schema):
+    """
+    Builds the validate callable for `schema` once per schema class.
+    A prebuilt TypeAdapter in `schema._adapter` is used as-is; other Pydantic
+    v2 models get a new TypeAdapter; v1 models fall back to parse_obj.
+    """
+    adapter = _prebuilt_adapter(schema)
+    if adapter is not None:
+        return adapter.validate_python
+    if hasattr(schema, "model_validate"):
+        from pydantic import TypeAdapter
+        return TypeAdapter(schema).validate_python
+    return schema.parse_obj
 
-    # 4. Single ➜ double quotes for keys
-    text = re.sub(r"'([^']+)':", r'"\1":', text)
+def _prebuilt_adapter(schema):
+    # Only the class's own `_adapter` counts, so a subclass never validates
+    # as its parent
+    adapter = vars(schema).get("_adapter")
+    return adapter if hasattr(adapter, "validate_python") else None
 
-    # 5. Quote bare keys
-    text = re.sub(r'([{,]\s*)([a-zA-Z0-9_]+)\s*:', r'\1"\2":', text)
+@functools.lru_cache(maxsize=128)
+def _list_adapter_for(schema):
+    from pydantic import TypeAdapter
+    return TypeAdapter(List[schema])
 
-    # 6. Balance braces/brackets
-    if text.count("{") == text.count("}") + 1:
-        text += "}"
-    if text.count("[") == text.count("]") + 1:
-        text += "]"
+def _is_struct(schema) -> bool:
+    # A Struct subclass implies msgspec is already imported; never import it here
+    msgspec = sys.modules.get("msgspec")
+    return (
+        msgspec is not None
+        and isinstance(schema, type)
+        and issubclass(schema, msgspec.Struct)
+    )
 
-    # 7. Try parsing again
+@functools.lru_cache(maxsize=128)
+def _struct_decoder(schema):
+    import msgspec
+    return msgspec.json.Decoder(schema, strict=False)
+
+def _decode_struct(raw: str, schema):
+    """Decodes `raw` straight into a msgspec.Struct, repairing it if needed."""
+    import msgspec
+    decoder = _struct_decoder(schema)
+    try:
+        return decoder.decode(raw)
+    except msgspec.ValidationError as err:
+        raise JsonFixError("Schema validation failed", raw) from err
+    except msgspec.DecodeError:
+        pass
     try:
-        return json.loads(text)
+        return decoder.decode(_repair_text(raw))
+    except msgspec.ValidationError as err:
+        raise JsonFixError("Schema validation failed", raw) from err
+    except msgspec.DecodeError as err:
+        raise JsonFixError("Failed to repair and parse JSON", raw) from err
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and (
+        hasattr(annotation, "model_fields") or hasattr(annotation, "__fields__")
+    )
+
+def _construct_recursive(schema, data: dict):
+    """
+    Builds `schema` from `data` without validation, recursing into fields
+    annotated with nested models (directly, Optional[...] or List[...]).
+    """
+    if hasattr(schema, "model_fields"):
+        annotations = {name: f.annotation for name, f in schema.model_fields.items()}
+        construct = schema.model_construct
+    else:  # pydantic v1
+        annotations = {name: f.outer_type_ for name, f in schema.__fields__.items()}
+        construct = schema.construct
+    values = dict(data)
+    for name, annotation in annotations.items():
+        if name in values:
+            values[name] = _construct_value(annotation, values[name])
+    return construct(**values)
+
+def _construct_value(annotation, value):
+    if _is_model(annotation):
+        return _construct_recursive(annotation, value) if isinstance(value, dict) else value
+    origin = getattr(annotation, "__origin__", None)
+    args = getattr(annotation, "__args__", None) or ()
+    if origin is Union:
+        args = [arg for arg in args if arg is not type(None)]
+        return _construct_value(args[0], value) if len(args) == 1 else value
+    if origin is list and args and isinstance(value, list):
+        return [_construct_value(args[0], item) for item in value]
+    return value
+
+_FENCE_MARKERS = ("```", "~~~")
+
+def _strip_fences(text: str) -> str:
+    """
+    Returns the body of the first markdown code fence in `text` that holds
+    JSON, or `text` unchanged if there is none. Handles ``` and ~~~ fences
+    of any length plus an optional language tag, using plain str.find
+    scans. Fence markers elsewhere in a line (e.g. inside a JSON string)
+    are ignored.
+    """
+    n = len(text)
+    opens = [_find_fence(text, marker, 0, closing=False) for marker in _FENCE_MARKERS]
+    while True:
+        found = [i for i in opens if i != -1]
+        if not found:
+            return text
+        start = min(found)
+
+        # Count the full fence run so ```` only closes on ```` (or longer)
+        i = start
+        fence_char = text[start]
+        while i < n and text[i] == fence_char:
+            i += 1
+        fence = text[start:i]
+
+        # Skip an optional language tag such as `json`
+        while i < n and (text[i].isalnum() or text[i] in "_-+"):
+            i += 1
+
+        end = _find_fence(text, fence, i, closing=True)
+        body = text[i:] if end == -1 else text[i:end]
+        if "{" in body or "[" in body:
+            return body
+        if end == -1:
+            # A lone fence after the JSON, as in '{"a": 1}\n```'
+            return text[:start]
+
+        # A fence without JSON (e.g. a ```python example): try the next one
+        pos = end + len(fence)
+        opens = [
+            i if i == -1 or i >= pos else _find_fence(text, marker, pos, closing=False)
+            for marker, i in zip(_FENCE_MARKERS, opens)
+        ]
+
+def _find_fence(text: str, marker: str, pos: int, closing: bool) -> int:
+    """
+    Finds `marker` at the start of a line (after optional spaces/tabs). A
+    closing fence may also end its line, as in '{"a": 1}```'. Each line is
+    checked once, however many markers it holds, so the scan stays linear.
+    """
+    n = len(text)
+    i = text.find(marker, pos)
+    while i != -1:
+        line_start = text.rfind("\n", 0, i) + 1
+        line_end = text.find("\n", i)
+        if line_end == -1:
+            line_end = n
+        if not text[line_start:i].strip(" \t"):
+            return i
+        if closing:
+            # Only the run of fence characters that ends the line can close
+            tail = text[i:line_end].rstrip(" \t\r")
+            if tail.endswith(marker):
+                return i + len(tail.rstrip(marker[0]))
+        if line_end == n:
+            return -1
+        i = text.find(marker, line_end + 1)
+    return -1
+
+def _try_repair(raw: str):
+    text = _repair_text(raw)
+    try:
+        return _loads(text)
     except Exception:
         raise JsonFixError("Failed to repair and parse JSON", raw)
+
+def _normalize_py(text: str):
+    """
+    Quotes bare keys, rewrites single-quoted strings as double-quoted ones
+    and drops trailing commas in a single pass, leaving double-quoted
+    strings untouched. Returns the new text plus the closing brackets still
+    needed to finish it, innermost first; brackets inside strings don't
+    count. Mirrored in C by _ensure_json_core.normalize.
+    """
+    # Copies runs of unchanged text as slices rather than one character at
+    # a time, so `out` holds a few pieces per token instead of one per char.
+    out = []
+    stack = []
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+        if ch == '"':
+            # Jump from quote to quote until one isn't escaped (odd run of \\)
+            end = text.find('"', i + 1)
+            while end != -1:
+                k = end
+                while text[k - 1] == "\\":
+                    k -= 1
+                if (end - k) % 2 == 0:
+                    break
+                end = text.find('"', end + 1)
+            end = n if end == -1 else end + 1
+            out.append(text[i:end])
+            i = end
+        elif ch == "'":
+            out.append('"')
+            i += 1
+            while i < n:
+                ch = text[i]
+                if ch == "'":
+                    out.append('"')
+                    i += 1
+                    break
+                if ch == '"':
+                    out.append('\\"')
+                    i += 1
+                elif ch == "\\":
+                    # \' needs no escape once the string is double-quoted
+                    if i + 1 < n:
+                        escaped = text[i + 1]
+                        out.append(escaped if escaped == "'" else "\\" + escaped)
+                    i += 2
+                else:
+                    j = i + 1
+                    while j < n and text[j] not in "'\"\\":
+                        j += 1
+                    out.append(text[i:j])
+                    i = j
+        elif ch.isalnum() or ch == "_":
+            # A bare word is a key when the next non-space character is ':'
+            j = i + 1
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            k = j
+            while k < n and text[k] in " \t\r\n":
+                k += 1
+            if k < n and text[k] == ":":
+                out.append('"' + text[i:j] + '"')
+            else:
+                out.append(text[i:j])
+            i = j
+        elif ch == "{" or ch == "[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+            i += 1
+        elif ch == "}" or ch == "]":
+            if stack:
+                stack.pop()
+            out.append(ch)
+            i += 1
+        elif ch == ",":
+            # Trailing comma: only whitespace before a closer or the end
+            k = i + 1
+            while k < n and text[k] in " \t\r\n":
+                k += 1
+            if k < n and text[k] not in "}]":
+                out.append(",")
+            i += 1
+        else:
+            j = i + 1
+            while j < n and text[j] not in "'\",{}[]" and not (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            out.append(text[i:j])
+            i = j
+    return "".join(out), "".join(reversed(stack))
+
+_normalize = _normalize_py
+try:
+    # Optional C extension, built by setup.py when a compiler is available
+    from _ensure_json_core import normalize as _normalize
+except ImportError:
+    pass
+
+# Repair is a pure function of the input, so retried or re-streamed LLM
+# outputs are served from a bounded cache. Only strings are cached; parsed
+# objects are mutable and are rebuilt on every call.
+@functools.lru_cache(maxsize=1024)
+def _repair_text(raw: str) -> str:
+    """Runs repair steps 1-6 and returns the repaired JSON text."""
+    text = raw
+
+    # 1. Remove markdown fences
+    text = _strip_fences(text)
+
+    # 2. Slice from first { or [
+    brace_pos = min([i for i in [text.find("{"), text.find("[")] if i != -1] or [0])
+    text = text[brace_pos:]
+
+    # 3 + 4 + 5 + 6. Remove trailing commas, single ➜ double quotes, quote
+    # bare keys and collect the missing closers, in one string-aware pass
+    text, closers = _normalize(text)
+    text += closers
+
+    return text
@@ -1,4 +1,15 @@
-from setuptools import setup, find_packages
+import sys
+
+from setuptools import Extension, setup, find_packages
+
+# Optional C speedup for the repair hot path; falls back to pure Python
+# if it can't be built.
+core = Extension(
+    "_ensure_json_core",
+    sources=["_ensure_json_core.c"],
+    extra_compile_args=[] if sys.platform == "win32" else ["-O3"],
+    optional=True,
+)
 
 setup(
     name="ensure-json",
@@ -8,9 +19,12 @@ setup(
     license="MIT",
     packages=find_packages(),
     py_modules=["ensure_json", "cli"],
+    ext_modules=[core],
     install_requires=[],
     extras_require={
-        "schema": ["pydantic>=1.10.0"]
+        "schema": ["pydantic>=1.10.0"],
+        "msgspec": ["msgspec>=0.18.0"],
+        "fast": ["orjson>=3.0.0"]
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,248 @@
+import random
+from typing import List, Optional
+
+import pytest
+
+import ensure_json as ej
+from ensure_json import JsonFixError, ensure_json, ensure_json_many
+
+try:
+    import _ensure_json_core
+except ImportError:
+    _ensure_json_core = None
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ('{"name": "Bob", "hobbies": ["reading", "coding",],}', {"name": "Bob", "hobbies": ["reading", "coding"]}),
+        ('{name: "Charlie", age: 25}', {"name": "Charlie", "age": 25}),
+        ("{name: 'Diana', 'age': 28, \"city\": 'London'}", {"name": "Diana", "age": 28, "city": "London"}),
+    ],
+)
+def test_repairs(raw, expected):
+    assert ensure_json(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ('```json\n{"name": "Alice", "age": 30}\n```', {"name": "Alice", "age": 30}),
+        ('Result: {"sep": "~~~"}', {"sep": "~~~"}),
+        ('{code: "use ```x``` here"}', {"code": "use ```x``` here"}),
+        ('Here is the result: {"snippet": "```py\\nx=1\\n```"}', {"snippet": "```py\nx=1\n```"}),
+        ('Here:\n  ```json\n{"a": "```"}\n  ```\nbye', {"a": "```"}),
+        ('```json {"a": 1}```', {"a": 1}),
+        ('{"a": 1}\n```', {"a": 1}),
+        ('```python\nx = 1\n```\n```json\n{"a": 1}\n```', {"a": 1}),
+    ],
+)
+def test_fence_markers_inside_strings(raw, expected):
+    assert ensure_json(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ('{"users": [{"name": "Eve"}, {"name": "Frank"', {"users": [{"name": "Eve"}, {"name": "Frank"}]}),
+        ('{"a": "]", "b": [1', {"a": "]", "b": [1]}),
+        ('{"a": "x}", "b": 1', {"a": "x}", "b": 1}),
+        ('[{"a": "[{"', [{"a": "[{"}]),
+    ],
+)
+def test_balance_ignores_brackets_inside_strings(raw, expected):
+    assert ensure_json(raw) == expected
+
+
+@pytest.mark.parametrize("number", [123456789012345678901234567890, -9223372036854775809])
+def test_integers_beyond_64_bits_keep_every_digit(number):
+    assert ej._loads('{"a": %d}' % number) == {"a": number}
+    assert ensure_json('{a: %d,}' % number) == {"a": number}
+    assert ensure_json('{"a": %d}' % number) == {"a": number}
+    assert ensure_json(b'{"a": %d}' % number) == {"a": number}
+
+
+def test_bytes_input():
+    assert ensure_json(b'{"a": 1}') == {"a": 1}
+    assert ensure_json(bytearray(b'[1, 2.5]')) == [1, 2.5]
+
+
+def test_long_digit_runs_in_strings_stay_on_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+
+    def fail(text):
+        raise AssertionError("fell back to json.loads")
+
+    monkeypatch.setattr(ej.json, "loads", fail)
+    assert ensure_json('{"id": "12345678901234567890", "n": 2.5}') == {"id": "12345678901234567890", "n": 2.5}
+
+
+def test_deep_nesting_without_orjson_raises_json_fix_error(monkeypatch):
+    # The stdlib parser hits its recursion limit here (orjson 3.8 parses it)
+    monkeypatch.setattr(ej, "_probe_loads", ej.json.loads)
+    monkeypatch.setattr(ej, "_loads", ej.json.loads)
+    raw = "[" * 100000 + "]" * 100000
+    with pytest.raises(JsonFixError) as info:
+        ensure_json(raw)
+    assert info.value.raw == raw
+
+
+def test_unrepairable_input_keeps_raw():
+    with pytest.raises(JsonFixError) as info:
+        ensure_json("This is not JSON at all!")
+    assert info.value.raw == "This is not JSON at all!"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("{a: 'it\\'s', \"b\": \"x, ]\", c: [1, 2,],}", ('{"a": "it\'s", "b": "x, ]", "c": [1, 2]}', "")),
+        ("{'q': 'say \"hi\"', 名前: '太郎'}", ('{"q": "say \\"hi\\"", "名前": "太郎"}', "")),
+        ("[1, 2,", ("[1, 2", "]")),
+        ("{a: [{'b': '}]'", ('{"a": [{"b": "}]"', "}]}")),
+        ("'unterminated \\", ('"unterminated ', "")),
+    ],
+)
+def test_normalize_cases(text, expected):
+    assert ej._normalize_py(text) == expected
+    if _ensure_json_core is not None:
+        assert _ensure_json_core.normalize(text) == expected
+
+
+@pytest.mark.skipif(_ensure_json_core is None, reason="C extension not built")
+def test_c_normalize_matches_python():
+    alphabet = list("{}[]:,,'\"\\ \n\tab_9xé名😀-.")
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert _ensure_json_core.normalize(text) == ej._normalize_py(text), text
+
+
+def test_prebuilt_adapter_is_not_inherited():
+    pydantic = pytest.importorskip("pydantic")
+    if not hasattr(pydantic, "TypeAdapter"):
+        pytest.skip("TypeAdapter needs pydantic v2")
+    from typing import ClassVar
+
+    class User(pydantic.BaseModel):
+        _adapter: ClassVar[pydantic.TypeAdapter]
+        name: str
+
+    User._adapter = pydantic.TypeAdapter(User)
+
+    class Admin(User):
+        role: str
+
+    assert isinstance(ensure_json('{name: "A"}', schema=User), User)
+    with pytest.raises(JsonFixError):
+        ensure_json('{name: "A"}', schema=Admin)
+    admin = ensure_json('{name: "A", role: "root"}', schema=Admin)
+    assert isinstance(admin, Admin)
+
+
+def test_invalid_validate_mode():
+    with pytest.raises(ValueError):
+        ensure_json("{}", validate="partial")
+
+
+def test_construct_builds_nested_models_without_validation():
+    pydantic = pytest.importorskip("pydantic")
+
+    class Tag(pydantic.BaseModel):
+        label: str
+
+    class Contact(pydantic.BaseModel):
+        email: str
+
+    class User(pydantic.BaseModel):
+        age: int = pydantic.Field(..., ge=0)
+        contact: Optional[Contact] = None
+        tags: List[Tag] = []
+
+    user = ensure_json(
+        '{age: -3, contact: {email: "x"}, tags: [{label: "a"},]}',
+        schema=User,
+        validate="construct",
+    )
+    assert user.age == -3
+    assert isinstance(user.contact, Contact)
+    assert isinstance(user.tags[0], Tag)
+
+    with pytest.raises(JsonFixError):
+        ensure_json('{age: -3}', schema=User)
+    assert ensure_json('{age: -3}', schema=User, validate="none") == {"age": -3}
+
+
+def test_msgspec_validation_error_surfaces_as_json_fix_error():
+    msgspec = pytest.importorskip("msgspec")
+
+    class User(msgspec.Struct):
+        name: str
+        age: int
+
+    assert ensure_json('{name: "A", age: "3",}', schema=User) == User(name="A", age=3)
+    raw = '{name: 1, age: 3}'
+    with pytest.raises(JsonFixError) as info:
+        ensure_json(raw, schema=User)
+    assert info.value.raw == raw
+    assert isinstance(info.value.__cause__, msgspec.ValidationError)
+
+
+def test_repair_cache_returns_fresh_objects():
+    raw = '{cached: [1, 2,]}'
+    first = ensure_json(raw)
+    first["cached"].append(3)
+    assert ensure_json(raw) == {"cached": [1, 2]}
+    assert ej._repair_text.cache_info().hits >= 1
+
+
+def test_many_preserves_order():
+    texts = ['{i: %d,}' % i for i in range(50)]
+    expected = [{"i": i} for i in range(50)]
+    assert ensure_json_many(texts) == expected
+    assert ensure_json_many(texts, max_workers=4) == expected
+
+
+def test_many_reports_failing_raw():
+    texts = ['{a: 1}', "not json", '{b: 2}']
+    with pytest.raises(JsonFixError) as info:
+        ensure_json_many(texts)
+    assert info.value.raw == "not json"
+
+
+def test_many_schema_failure_reports_failing_raw():
+    pydantic = pytest.importorskip("pydantic")
+
+    class Item(pydantic.BaseModel):
+        n: int = pydantic.Field(..., ge=0)
+
+    assert ensure_json_many(['{n: 1}', '{n: "2"}'], schema=Item) == [Item(n=1), Item(n=2)]
+    with pytest.raises(JsonFixError) as info:
+        ensure_json_many(['{n: 1}', '{n: -1}'], schema=Item)
+    assert info.value.raw == '{n: -1}'
+
+
+def test_many_uses_prebuilt_adapter():
+    pydantic = pytest.importorskip("pydantic")
+    if not hasattr(pydantic, "TypeAdapter"):
+        pytest.skip("TypeAdapter needs pydantic v2")
+    from typing import ClassVar
+
+    calls = []
+
+    class CountingAdapter:
+        def __init__(self, adapter):
+            self.adapter = adapter
+
+        def validate_python(self, obj):
+            calls.append(obj)
+            return self.adapter.validate_python(obj)
+
+    class Item(pydantic.BaseModel):
+        _adapter: ClassVar[CountingAdapter]
+        n: int
+
+    Item._adapter = CountingAdapter(pydantic.TypeAdapter(Item))
+
+    assert ensure_json_many(['{n: 1}', '{n: "2"}'], schema=Item) == [Item(n=1), Item(n=2)]
+    assert calls == [{"n": 1}, {"n": "2"}]
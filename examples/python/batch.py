@@ -0,0 +1,104 @@
+"""
+Batch processing with ensureJson.
+
+This example repairs a large batch of noisy LLM outputs in one call with
+ensure_json_many, e.g. for eval pipelines or batched sampling.
+
+Usage:
+    python batch.py
+"""
+
+import os
+import random
+import time
+
+from ensure_json import ensure_json_many, JsonFixError
+
+
+def make_noisy_outputs(count: int) -> list:
+    """Build `count` distinct 'almost-JSON' strings in typical LLM styles."""
+    rng = random.Random(42)
+    templates = [
+        # Markdown fence with chatter
+        'Here you go:\n```json\n{{"id": {i}, "name": "user{i}", "score": {s}}}\n```\nDone!',
+        # Trailing commas
+        '{{"id": {i}, "tags": ["a", "b",], "score": {s},}}',
+        # Unquoted keys
+        '{{id: {i}, name: "user{i}", score: {s}}}',
+        # Mixed quotes
+        "{{'id': {i}, name: 'user{i}', \"score\": {s}}}",
+        # Truncated output
+        '{{"id": {i}, "items": [{{"score": {s}}}, {{"score": {s}}}',
+        # Already valid
+        '{{"id": {i}, "score": {s}}}',
+    ]
+    return [
+        rng.choice(templates).format(i=i, s=rng.randint(0, 100))
+        for i in range(count)
+    ]
+
+
+def example_1_batch():
+    """Repair and parse a whole batch in one call."""
+    print("=" * 60)
+    print("Example 1: Batch Repair")
+    print("=" * 60)
+
+    outputs = make_noisy_outputs(10_000)
+
+    start = time.perf_counter()
+    results = ensure_json_many(outputs)
+    elapsed = time.perf_counter() - start
+
+    print(f"Parsed {len(results)} outputs in {elapsed * 1000:.1f} ms")
+    print(f"First: {results[0]}")
+    print(f"Last:  {results[-1]}")
+    print()
+
+
+def example_2_thread_pool():
+    """Run the same kind of batch through a thread pool, for comparison."""
+    print("=" * 60)
+    print("Example 2: Thread Pool")
+    print("=" * 60)
+
+    # Use fresh inputs so the repair cache from example 1 doesn't help
+    outputs = [text + " " for text in make_noisy_outputs(10_000)]
+    workers = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    results = ensure_json_many(outputs, max_workers=workers)
+    elapsed = time.perf_counter() - start
+
+    # Only the C extension's scan releases the GIL; fence stripping, parsing
+    # and validation hold it, so compare this with example 1 before using
+    # max_workers. On small outputs the pool is usually the slower one.
+    print(f"Parsed {len(results)} outputs with {workers} workers in {elapsed * 1000:.1f} ms")
+    print()
+
+
+def example_3_error_handling():
+    """A single bad input fails the batch with its own raw text."""
+    print("=" * 60)
+    print("Example 3: Error Handling")
+    print("=" * 60)
+
+    outputs = make_noisy_outputs(100)
+    outputs[57] = "This is not JSON at all!"
+
+    try:
+        ensure_json_many(outputs)
+    except JsonFixError as err:
+        print(f"❌ Error: {err}")
+        print(f"   Offending input: {err.raw}")
+    print()
+
+
+if __name__ == "__main__":
+    print("\n🔧 ensureJson - Batch Examples\n")
+
+    example_1_batch()
+    example_2_thread_pool()
+    example_3_error_handling()
+
+    print("✅ All examples completed!")
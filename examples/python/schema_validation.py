@@ -10,12 +10,13 @@ Usage:
     python schema_validation.py
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr, Field, ValidationError
+from typing import ClassVar, List, Optional
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, ValidationError
 from ensure_json import ensure_json, JsonFixError
 
 
-# Define schemas using Pydantic
+# Define schemas using Pydantic. The top-level models carry a prebuilt TypeAdapter in
+# `_adapter`, which ensure_json picks up instead of building its own.
 class ContactInfo(BaseModel):
     """Contact information schema."""
     email: EmailStr
@@ -30,6 +31,11 @@ class User(BaseModel):
     hobbies: List[str] = []
     contact: Optional[ContactInfo] = None
 
+    _adapter: ClassVar[TypeAdapter]
+
+
+User._adapter = TypeAdapter(User)
+
 
 class Product(BaseModel):
     """Product schema."""
@@ -39,6 +45,11 @@ class Product(BaseModel):
     in_stock: bool = True
     tags: List[str] = []
 
+    _adapter: ClassVar[TypeAdapter]
+
+
+Product._adapter = TypeAdapter(Product)
+
 
 def example_1_valid_schema():
     """Example with valid data that matches schema."""
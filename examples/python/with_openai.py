@@ -2,7 +2,11 @@
 Using ensureJson with OpenAI GPT models.
 
 This example shows how to parse structured JSON outputs from GPT,
-even when the model returns imperfect JSON.
+even when the model returns imperfect JSON. Requests use JSON mode
+(response_format={"type": "json_object"}), so well-formed replies take
+ensure_json's fast path. The three examples run concurrently through
+AsyncOpenAI; each also has a sync version. Responses are streamed and
+parsed as soon as the JSON value is complete.
 
 Requirements:
     pip install openai ensure-json
@@ -12,49 +16,139 @@ Usage:
     python with_openai.py
 """
 
+import asyncio
+import functools
+import json
 import os
-from openai import OpenAI
+from typing import TYPE_CHECKING
 from ensure_json import ensure_json, JsonFixError
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+
+# Static instructions go in the system message and stay byte-identical
+# between calls, so OpenAI's prompt cache can reuse the shared prefix.
+# Only the trailing user message changes from call to call.
+_SYSTEM_PROFILE = (
+    "You are a helpful assistant that returns user profiles in JSON format.\n"
+    "Generate a fictional user profile for the name the user gives you.\n"
+    "Return ONLY valid JSON with these fields:\n"
+    "- name (string)\n"
+    "- age (number)\n"
+    "- occupation (string)\n"
+    "- hobbies (array of strings)\n"
+    "- contact (object with email and phone)"
+)
+
+_SYSTEM_TODO = (
+    "Create a JSON object with a \"todos\" array of todo items for the role the user gives you.\n"
+    "Each item should have: id (number), task (string), "
+    "priority (low/medium/high), completed (boolean)"
+)
+
+_SYSTEM_EXTRACT = (
+    "Extract structured data from the text the user gives you and return as JSON.\n"
+    "Return JSON with: name, age, occupation, location, email, phone, interests (array)"
+)
+
+# Per-call user prompts. The profile prompt is split around the name so it
+# is built by plain concatenation; the other two are fully constant.
+_PROFILE_PROMPT_PREFIX = "Generate a fictional user profile for "
+_PROFILE_PROMPT_SUFFIX = "."
+
+_TODO_PROMPT = "5 todo items for a software developer."
+
+_EXTRACT_TEXT = """
+John Doe is a 32-year-old software engineer living in San Francisco.
+He can be reached at john.doe@email.com or (555) 123-4567.
+His interests include machine learning, rock climbing, and photography.
+"""
 
-def get_user_profile(name: str) -> dict:
-    """
-    Ask GPT to generate a user profile and parse the JSON response.
 
-    Args:
-        name: User name to generate profile for
+@functools.lru_cache(maxsize=1)
+def _client() -> "OpenAI":
+    """Shared client, so every example reuses one connection pool."""
+    # Imported here so importing this module doesn't load openai/httpx
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-    Returns:
-        Parsed user profile as a dictionary
-    """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-    # Ask GPT to return JSON (it might not be perfect!)
-    response = client.chat.completions.create(
-        model="gpt-4",
+@functools.lru_cache(maxsize=1)
+def _async_client() -> "AsyncOpenAI":
+    """Shared async client, used from a single event loop in main()."""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def _is_complete(text: str) -> bool:
+    """
+    Cheap check run while streaming: True once `text` holds a complete JSON
+    value, so the rest of the stream (e.g. trailing chatter) can be skipped.
+    """
+    opened = text.count("{") + text.count("[")
+    if not opened or opened != text.count("}") + text.count("]"):
+        return False
+    if text.count("```") % 2:
+        return False  # still inside a markdown fence
+    start = min(i for i in (text.find("{"), text.find("[")) if i != -1)
+    end = max(text.rfind("}"), text.rfind("]"))
+    try:
+        json.loads(text[start:end + 1])
+    except ValueError:
+        return False
+    return True
+
+
+def _read_stream(stream) -> str:
+    """Collects streamed deltas, stopping early once the JSON is complete."""
+    parts = []
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        parts.append(delta)
+        # Only a closing bracket can complete the value
+        if ("}" in delta or "]" in delta) and _is_complete("".join(parts)):
+            stream.close()
+            break
+    return "".join(parts)
+
+
+async def _read_stream_async(stream) -> str:
+    """Async version of _read_stream."""
+    parts = []
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+        parts.append(delta)
+        if ("}" in delta or "]" in delta) and _is_complete("".join(parts)):
+            await stream.close()
+            break
+    return "".join(parts)
+
+
+def _user_profile_request(name: str) -> dict:
+    """Arguments for the chat completion behind get_user_profile."""
+    # JSON mode makes the server return syntactically valid JSON, so
+    # ensure_json's first json.loads succeeds and the repair pass is skipped.
+    # ensure_json still covers models or providers without JSON mode.
+    return dict(
+        model="gpt-4o",
         messages=[
-            {
-                "role": "system",
-                "content": "You are a helpful assistant that returns user profiles in JSON format."
-            },
-            {
-                "role": "user",
-                "content": f"""Generate a fictional user profile for {name}.
-                Return ONLY valid JSON with these fields:
-                - name (string)
-                - age (number)
-                - occupation (string)
-                - hobbies (array of strings)
-                - contact (object with email and phone)
-                """
-            }
+            {"role": "system", "content": _SYSTEM_PROFILE},
+            {"role": "user", "content": _PROFILE_PROMPT_PREFIX + name + _PROFILE_PROMPT_SUFFIX},
         ],
+        response_format={"type": "json_object"},
+        stream=True,
         temperature=0.7,
     )
 
-    # Extract the response
-    llm_output = response.choices[0].message.content
 
+def _parse_user_profile(llm_output: str) -> dict:
+    print("=" * 70)
+    print("\n📋 Example 1: Generate User Profile\n")
     print("🤖 GPT Response:")
     print(llm_output)
     print()
@@ -71,35 +165,49 @@ def get_user_profile(name: str) -> dict:
         raise
 
 
-def get_todo_list() -> list:
+def get_user_profile(name: str) -> dict:
     """
-    Ask GPT to generate a todo list in JSON format.
+    Ask GPT to generate a user profile and parse the JSON response.
+
+    Args:
+        name: User name to generate profile for
 
     Returns:
-        List of todo items
+        Parsed user profile as a dictionary
     """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    stream = _client().chat.completions.create(**_user_profile_request(name))
+    return _parse_user_profile(_read_stream(stream))
+
+
+async def get_user_profile_async(name: str) -> dict:
+    """Async version of get_user_profile."""
+    stream = await _async_client().chat.completions.create(**_user_profile_request(name))
+    return _parse_user_profile(await _read_stream_async(stream))
 
-    response = client.chat.completions.create(
+
+def _todo_list_request() -> dict:
+    """Arguments for the chat completion behind get_todo_list."""
+    return dict(
         model="gpt-3.5-turbo",
         messages=[
-            {
-                "role": "user",
-                "content": """Create a JSON array of 5 todo items for a software developer.
-                Each item should have: id (number), task (string), priority (low/medium/high), completed (boolean)
-                """
-            }
+            {"role": "system", "content": _SYSTEM_TODO},
+            {"role": "user", "content": _TODO_PROMPT},
         ],
+        response_format={"type": "json_object"},
+        stream=True,
     )
 
-    llm_output = response.choices[0].message.content
 
+def _parse_todo_list(llm_output: str) -> list:
+    print("=" * 70)
+    print("\n📋 Example 2: Generate Todo List\n")
     print("🤖 GPT Response:")
     print(llm_output)
     print()
 
-    # Parse the response
-    todos = ensure_json(llm_output)
+    # Parse the response (JSON mode only allows an object at the top level)
+    result = ensure_json(llm_output)
+    todos = result.get("todos", []) if isinstance(result, dict) else result
     print("✅ Parsed todos:")
     for todo in todos:
         status = "✅" if todo.get("completed") else "⬜"
@@ -108,38 +216,39 @@ def get_todo_list() -> list:
     return todos
 
 
-def extract_structured_data() -> dict:
+def get_todo_list() -> list:
     """
-    Use GPT for data extraction and parse the result.
+    Ask GPT to generate a todo list in JSON format.
 
     Returns:
-        Extracted structured data
+        List of todo items
     """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    stream = _client().chat.completions.create(**_todo_list_request())
+    return _parse_todo_list(_read_stream(stream))
 
-    text = """
-    John Doe is a 32-year-old software engineer living in San Francisco.
-    He can be reached at john.doe@email.com or (555) 123-4567.
-    His interests include machine learning, rock climbing, and photography.
-    """
 
-    response = client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "user",
-                "content": f"""Extract structured data from this text and return as JSON:
+async def get_todo_list_async() -> list:
+    """Async version of get_todo_list."""
+    stream = await _async_client().chat.completions.create(**_todo_list_request())
+    return _parse_todo_list(await _read_stream_async(stream))
 
-                {text}
 
-                Return JSON with: name, age, occupation, location, email, phone, interests (array)
-                """
-            }
+def _extract_structured_data_request() -> dict:
+    """Arguments for the chat completion behind extract_structured_data."""
+    return dict(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": _SYSTEM_EXTRACT},
+            {"role": "user", "content": _EXTRACT_TEXT},
         ],
+        response_format={"type": "json_object"},
+        stream=True,
     )
 
-    llm_output = response.choices[0].message.content
 
+def _parse_structured_data(llm_output: str) -> dict:
+    print("=" * 70)
+    print("\n📋 Example 3: Extract Structured Data\n")
     print("🤖 GPT Response:")
     print(llm_output)
     print()
@@ -152,8 +261,25 @@ def extract_structured_data() -> dict:
     return data
 
 
-def main():
-    """Run all examples."""
+def extract_structured_data() -> dict:
+    """
+    Use GPT for data extraction and parse the result.
+
+    Returns:
+        Extracted structured data
+    """
+    stream = _client().chat.completions.create(**_extract_structured_data_request())
+    return _parse_structured_data(_read_stream(stream))
+
+
+async def extract_structured_data_async() -> dict:
+    """Async version of extract_structured_data."""
+    stream = await _async_client().chat.completions.create(**_extract_structured_data_request())
+    return _parse_structured_data(await _read_stream_async(stream))
+
+
+async def main():
+    """Run all examples concurrently."""
     print("\n" + "=" * 70)
     print("🔧 ensureJson + OpenAI Examples")
     print("=" * 70 + "\n")
@@ -165,19 +291,14 @@ def main():
         return
 
     try:
-        # Example 1: User profile
-        print("\n📋 Example 1: Generate User Profile\n")
-        profile = get_user_profile("Alice")
-
-        # Example 2: Todo list
-        print("\n" + "=" * 70)
-        print("\n📋 Example 2: Generate Todo List\n")
-        todos = get_todo_list()
-
-        # Example 3: Data extraction
-        print("\n" + "=" * 70)
-        print("\n📋 Example 3: Extract Structured Data\n")
-        data = extract_structured_data()
+        # The three requests are independent, so wait for the slowest
+        # instead of their sum. Results print as each response arrives.
+        print("\n📋 Running: user profile, todo list, data extraction\n")
+        profile, todos, data = await asyncio.gather(
+            get_user_profile_async("Alice"),
+            get_todo_list_async(),
+            extract_structured_data_async(),
+        )
 
         print("\n" + "=" * 70)
         print("\n✅ All examples completed successfully!")
@@ -189,4 +310,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())